@@ -0,0 +1,9 @@
+"""
+Google Trends to Google Sheets Dashboard
+
+Fetches Google Trends data for keywords related to:
+1. Bondi Beach incident ("Bondi shooting")
+2. Crisis support services ("Lifeline", "Crisis support")
+
+Writes data to a Google Sheet for stakeholder monitoring.
+"""
@@ -0,0 +1,650 @@
+"""
+Shared configuration and helpers for the dashboard: credentials, retries and
+rate limiting, Google Trends fetching and caching, formatting, and the
+low-level Google Sheets writes.
+"""
+
+import copy
+import hashlib
+import math
+import os
+import pickle
+import random
+import sqlite3
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from time import monotonic, sleep
+
+import gspread
+import numpy as np
+import orjson
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+from gspread.urls import SPREADSHEET_VALUES_BATCH_UPDATE_URL
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from pytrends.exceptions import ResponseError, TooManyRequestsError
+from pytrends.request import TrendReq
+from zoneinfo import ZoneInfo
+
+# Load environment variables from .env file (for local development)
+load_dotenv()
+
+# Google Sheet configuration
+SPREADSHEET_ID = "1aSC_o7FqYVTB9B96RJQGphhwzDGJfIbPAgTR5kXwKbo"
+
+# Incident start time: 3pm AEDT on Sunday 14th December 2025
+INCIDENT_START = datetime(2025, 12, 14, 15, 0, tzinfo=ZoneInfo("Australia/Sydney"))
+
+# Google Trends region
+TRENDS_GEO = "AU"
+
+# Local cache of Trends responses, reused for repeat runs within the same hour
+TRENDS_CACHE_PATH = os.environ.get("TRENDS_CACHE_PATH", "trends_cache.sqlite")
+
+# Upper bound on a random delay before the first request, so scheduled runs
+# don't hit Google Trends in lockstep (set in the GitHub Actions workflow)
+START_JITTER_SECONDS = float(os.environ.get("START_JITTER_SECONDS", "0"))
+
+# Topics fetched and written at the same time
+MAX_TOPIC_WORKERS = 4
+
+# Maximum rows written to a traffic tab; longer series are averaged into wider buckets
+MAX_INTEREST_ROWS = 500
+
+# Write traffic tabs as one SPLIT formula cell instead of a value per cell. Much smaller
+# write, but the tab then shows formula output, so leave off for tabs people edit or sort
+INTEREST_AS_FORMULA = os.environ.get("INTEREST_AS_FORMULA", "0") == "1"
+
+# Size of each worksheet we create, with room for MAX_INTEREST_ROWS
+WORKSHEET_ROWS = 1000
+WORKSHEET_COLS = 20
+
+# Cells (in the last worksheet column) recording the rows/cols each tab was last
+# written with, and a signature of those values so unchanged tabs can be skipped
+EXTENT_RANGE = "T1:T3"
+
+# HTTP statuses worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Keyword configurations for each tab
+TABS_CONFIG = {
+    "Bondi Beach": {
+        "keywords": ["Bondi shooting"],
+        "description": "Incident monitoring",
+    },
+    "Crisis Support": {
+        "keywords": ["Lifeline", "Crisis support"],
+        "description": "Distress signals monitoring",
+    },
+}
+
+
+@lru_cache(maxsize=1)
+def get_google_sheets_client():
+    """
+    Authenticate with Google Sheets using service account credentials.
+    
+    Credentials can come from:
+    1. GOOGLE_SHEETS_CREDS environment variable (JSON string)
+    2. GOOGLE_SHEETS_CREDS_FILE environment variable (path to JSON file)
+    """
+    creds_json = os.environ.get("GOOGLE_SHEETS_CREDS")
+    creds_file = os.environ.get("GOOGLE_SHEETS_CREDS_FILE")
+    
+    if creds_json:
+        # Parse JSON string from environment variable
+        creds_dict = orjson.loads(creds_json)
+        client = gspread.service_account_from_dict(creds_dict)
+    elif creds_file:
+        # Load from file path
+        client = gspread.service_account(filename=creds_file)
+    else:
+        raise ValueError(
+            "No credentials found. Set GOOGLE_SHEETS_CREDS (JSON string) "
+            "or GOOGLE_SHEETS_CREDS_FILE (path to JSON file)"
+        )
+    
+    return client
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether an error from pytrends or gspread is worth retrying.
+    """
+    if isinstance(error, (ResponseError, gspread.exceptions.APIError)):
+        return error.response.status_code in RETRYABLE_STATUSES
+    # Dropped connections and read timeouts never reached a status code
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def retry_after(error: Exception) -> float | None:
+    """
+    Seconds the server asked us to wait (Retry-After header), if it sent a number.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+def retry(func, *args, max_tries: int = 5, max_total_wait: float = 100, cap: float = 60, **kwargs):
+    """
+    Call func(*args, **kwargs), retrying retryable errors with truncated
+    exponential backoff and full jitter.
+    
+    The base delay is solved from base * (2^0 + ... + 2^(max_tries-2)) = max_total_wait,
+    so the worst case never sleeps longer than max_total_wait in total.
+    A Retry-After from the server raises the delay to at least that (up to `cap`).
+    Non-retryable errors, and the last failed attempt, are re-raised.
+    """
+    base = max_total_wait / (2 ** (max_tries - 1) - 1)
+    for attempt in range(max_tries):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_tries - 1 or not is_retryable(e):
+                raise
+            delay = random.uniform(0, min(base * 2 ** attempt, cap))
+            delay = max(delay, min(retry_after(e) or 0, cap))
+            print(f"  Retryable error ({e}), retrying in {delay:.1f}s")
+            sleep(delay)
+
+
+class TokenBucket:
+    """
+    Token bucket that paces requests to stay under a quota.
+    
+    consume() blocks until a token is available. After throttle() (called on a
+    429) the refill rate drops to half, then recovers linearly over `recovery`
+    seconds. Safe to share between threads.
+    """
+    
+    def __init__(self, rate: float, capacity: float, recovery: float = 60):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.recovery = recovery
+        self.tokens = capacity
+        self.updated = monotonic()
+        self.throttled_at = None
+        self.lock = threading.Lock()
+    
+    def _current_rate(self, now: float) -> float:
+        if self.throttled_at is None:
+            return self.rate
+        elapsed = now - self.throttled_at
+        if elapsed >= self.recovery:
+            self.throttled_at = None
+            return self.rate
+        return self.rate * (0.5 + 0.5 * elapsed / self.recovery)
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self._current_rate(now))
+        self.updated = now
+    
+    def consume(self, tokens: float = 1):
+        """
+        Take tokens from the bucket, sleeping until they have been refilled if it is empty.
+        """
+        with self.lock:
+            now = monotonic()
+            self._refill(now)
+            # Reserve the tokens now (possibly going negative) and wait outside the lock
+            self.tokens -= tokens
+            wait = -self.tokens / self._current_rate(now) if self.tokens < 0 else 0
+        if wait > 0:
+            sleep(wait)
+    
+    def throttle(self):
+        """
+        Halve the refill rate after a rate-limit response.
+        """
+        with self.lock:
+            now = monotonic()
+            self._refill(now)
+            self.throttled_at = now
+
+
+# Sheets allows 60 write requests per minute per user. Any 60 seconds can see a full
+# bucket plus a minute of refill (10 + 45 = 55 writes), leaving some headroom
+SHEETS_WRITE_BUCKET = TokenBucket(rate=45 / 60.0, capacity=10)
+
+
+def write_request(func, *args, **kwargs):
+    """
+    Send a Sheets write request through SHEETS_WRITE_BUCKET, retrying retryable errors.
+    """
+    def attempt():
+        SHEETS_WRITE_BUCKET.consume()
+        try:
+            return func(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code == 429:
+                SHEETS_WRITE_BUCKET.throttle()
+            raise
+    
+    return retry(attempt)
+
+
+# Google Trends requests in one uncached run: the cookie request, then build_payload
+# and interest_over_time per topic, plus one related_queries request per keyword
+TRENDS_REQUESTS_PER_RUN = 1 + sum(2 + len(config["keywords"]) for config in TABS_CONFIG.values())
+
+# Google Trends has no published quota; a normal run goes out in one burst,
+# anything beyond that (retries, repeat runs) is paced at about 10 a minute
+TRENDS_BUCKET = TokenBucket(rate=10 / 60.0, capacity=TRENDS_REQUESTS_PER_RUN)
+
+
+def trends_request(func, *args, tokens: float = 1, **kwargs):
+    """
+    Send a Google Trends request through TRENDS_BUCKET, retrying retryable errors.
+    `tokens` is the number of HTTP requests the call makes.
+    """
+    def attempt():
+        TRENDS_BUCKET.consume(tokens)
+        try:
+            return func(*args, **kwargs)
+        except TooManyRequestsError:
+            TRENDS_BUCKET.throttle()
+            raise
+    
+    return retry(attempt)
+
+
+def get_timeframe(run_ts: datetime):
+    """
+    Calculate the timeframe string for pytrends.
+    Goes from incident start (3pm Dec 14) to the run's start time.
+    
+    Format: 'YYYY-MM-DDTHH YYYY-MM-DDTHH' for hourly granularity
+    pytrends uses UTC internally.
+    """
+    # Convert incident start to UTC for pytrends
+    start_utc = INCIDENT_START.astimezone(timezone.utc)
+    end_utc = run_ts.astimezone(timezone.utc)
+    
+    # Format for pytrends (hourly granularity)
+    start_str = start_utc.strftime("%Y-%m-%dT%H")
+    end_str = end_utc.strftime("%Y-%m-%dT%H")
+    
+    return f"{start_str} {end_str}"
+
+
+# Topic fetches run in parallel; only the first one to ask should build the client
+TRENDS_CLIENT_LOCK = threading.Lock()
+
+
+def get_trends_client() -> TrendReq:
+    """
+    Get the shared pytrends client, creating it on first use.
+    Thread-safe: concurrent first callers wait for one client rather than each building their own.
+    """
+    with TRENDS_CLIENT_LOCK:
+        return create_trends_client()
+
+
+@lru_cache(maxsize=1)
+def create_trends_client() -> TrendReq:
+    """
+    Create the shared pytrends client once per run; use get_trends_client() instead.
+    The TrendReq constructor makes a request to fetch a Google cookie, so it is
+    paced and retried like any other Trends request.
+    """
+    return trends_request(TrendReq, hl="en-AU", tz=600)  # Australian English, AEST timezone
+
+
+def open_trends_cache() -> sqlite3.Connection:
+    """
+    Open the SQLite response cache, creating the table on first use.
+    WAL mode lets concurrent topic fetches (and overlapping runs) write safely.
+    """
+    conn = sqlite3.connect(TRENDS_CACHE_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, value BLOB, ts INTEGER)")
+    return conn
+
+
+def trends_cache_key(keywords: list[str], timeframe: str, run_ts: datetime) -> bytes:
+    """
+    Build the cache key for a Trends query.
+    Includes the run's UTC hour, since Trends data only changes hourly.
+    """
+    hour = run_ts.astimezone(timezone.utc).strftime("%Y%m%d%H")
+    return hashlib.blake2b(pickle.dumps((tuple(keywords), timeframe, TRENDS_GEO, hour))).digest()
+
+
+def downcast_interest(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the integer interest columns as int8, since Trends values are 0-100.
+    Shrinks the DataFrame (and its cache entry) 8x compared to int64.
+    """
+    num_cols = df.select_dtypes("integer").columns
+    if len(num_cols) == 0:
+        return df
+    
+    values = df[num_cols]
+    if ((values < 0) | (values > 127)).any().any():
+        raise ValueError("Interest values outside the 0-127 range, can't store as int8")
+    
+    df[num_cols] = values.astype("int8")
+    return df
+
+
+def fetch_trends_data(keywords: list[str], timeframe: str, run_ts: datetime):
+    """
+    Fetch Google Trends data for the given keywords.
+    
+    Args:
+        keywords: List of keywords to search for
+        timeframe: pytrends timeframe from get_timeframe(), shared by every topic
+        run_ts: Start time of this run, shared by every topic
+        
+    Returns:
+        Dictionary containing:
+        - interest_over_time: DataFrame with hourly interest data
+        - related_queries: Dictionary of related queries per keyword
+        
+        Results are cached per hour, so re-runs within the same hour skip Google Trends.
+    """
+    cache_key = trends_cache_key(keywords, timeframe, run_ts)
+    with closing(open_trends_cache()) as cache:
+        row = cache.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
+    if row is not None:
+        print(f"  Using cached trends for: {keywords}")
+        return pickle.loads(row[0])
+    
+    # Copy the shared client so concurrent topics don't share payload state,
+    # while still reusing its Google cookie
+    pytrends = copy.deepcopy(get_trends_client())
+    
+    # Build payload with keywords
+    trends_request(pytrends.build_payload, keywords, cat=0, timeframe=timeframe, geo=TRENDS_GEO)
+    
+    # Fetch interest over time and related queries at the same time. Both only
+    # read the widget tokens from build_payload, so they can share the client,
+    # and each retries on its own so a 429 on one doesn't cancel the other.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        interest_future = executor.submit(trends_request, pytrends.interest_over_time)
+        # related_queries sends one request per keyword
+        related_future = executor.submit(trends_request, pytrends.related_queries, tokens=len(keywords))
+        data = {
+            "interest_over_time": downcast_interest(interest_future.result()),
+            "related_queries": related_future.result(),
+        }
+    
+    # Store in the cache, dropping entries older than a day
+    now = int(run_ts.timestamp())
+    with closing(open_trends_cache()) as cache, cache:
+        cache.execute(
+            "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+            (cache_key, sqlite3.Binary(pickle.dumps(data)), now),
+        )
+        cache.execute("DELETE FROM cache WHERE ts < ?", (now - 86400,))
+    
+    return data
+
+
+def format_timestamps(timestamps: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Format timezone-aware timestamps as local 'YYYY-MM-DD HH:MM' strings.
+    
+    Vectorized: NumPy formats the local wall-clock time at minute precision
+    ('YYYY-MM-DDTHH:MM') in C, and the 'T' is swapped for a space.
+    """
+    strings = timestamps.tz_localize(None).to_numpy(dtype="datetime64[m]").astype("U16")
+    if strings.size == 0:
+        return strings
+    return np.char.replace(strings, "T", " ")
+
+
+def clean_interest(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce the keyword columns (everything but 'isPartial') to int8 (values are 0-100),
+    with non-numbers as 0. Sometimes pytrends returns datetime objects instead of numbers.
+    """
+    interest = df.drop(columns="isPartial", errors="ignore")
+    # to_numeric turns datetime objects in object columns into NaN, but whole
+    # datetime64 columns into epoch numbers, so those are dropped and come back as NaN
+    datetime_cols = interest.select_dtypes(include=["datetime", "datetimetz"]).columns
+    numeric = interest.drop(columns=datetime_cols).apply(pd.to_numeric, errors="coerce")
+    return numeric.reindex(columns=interest.columns).fillna(0).astype("int8")
+
+
+def downsample_interest(df: pd.DataFrame, max_rows: int = MAX_INTEREST_ROWS) -> pd.DataFrame:
+    """
+    Average interest data into wider time buckets if it has more than max_rows rows.
+    Expects a DatetimeIndex and numeric keyword columns.
+    """
+    if len(df) <= max_rows:
+        return df
+    
+    factor = math.ceil(len(df) / max_rows)
+    step = df.index.to_series().diff().median()
+    resampled = df.resample(step * factor, origin="start").mean().round().fillna(0).astype("int8")
+    print(f"  Downsampled interest data from {len(df)} to {len(resampled)} rows (factor {factor})")
+    return resampled
+
+
+def interest_to_rows(df: pd.DataFrame, keywords: list[str]) -> list[list]:
+    """
+    Build the traffic tab grid straight from the pytrends interest DataFrame.
+    Headers on row 1, one row per timestamp in Australian Eastern time.
+    """
+    if df.empty:
+        return [["Message"], ["No data available for this time period"]]
+    
+    # Numeric keyword columns, without the 'isPartial' flag
+    interest = clean_interest(df)
+    
+    # Keep the payload bounded for long timeframes
+    interest = downsample_interest(interest)
+    
+    # Convert to Australian Eastern time and format for readability
+    # pytrends returns UTC timestamps without timezone info, so localize first
+    timestamps = format_timestamps(interest.index.tz_localize("UTC").tz_convert("Australia/Sydney"))
+    
+    columns = [interest[col].tolist() for col in interest.columns]
+    return [["Timestamp", *interest.columns]] + [list(row) for row in zip(timestamps.tolist(), *columns)]
+
+
+def rows_to_split_formula(rows: list[list]) -> list[list]:
+    """
+    Pack a grid into a single cell: a tab/newline separated blob that SPLIT
+    expands back into the full grid below and to the right of the cell.
+    """
+    blob = "\n".join("\t".join(str(value) for value in row) for row in rows)
+    blob = blob.replace('"', '""')
+    formula = (
+        f'=ARRAYFORMULA(SPLIT(TRANSPOSE(SPLIT("{blob}", CHAR(10), FALSE, FALSE)), '
+        f'CHAR(9), FALSE, FALSE))'
+    )
+    return [[formula]]
+
+
+def related_to_rows(related_queries: dict, keywords: list[str]) -> list[list]:
+    """
+    Build the related queries tab grid: the top 10 "Top" and "Rising" queries per keyword.
+    Headers on row 1.
+    """
+    rows = [["Keyword", "Type", "Related Query", "Value"]]
+    
+    for keyword in keywords:
+        keyword_data = related_queries.get(keyword) or {}
+        
+        for query_type in ("top", "rising"):
+            df = keyword_data.get(query_type)
+            if df is not None and not df.empty:
+                df = df.head(10)
+                label = query_type.title()
+                rows.extend(
+                    [keyword, label, query, value]
+                    for query, value in zip(df["query"].tolist(), df["value"].tolist())
+                )
+    
+    if len(rows) == 1:
+        return [["Message"], ["No related queries found"]]
+    
+    return rows
+
+
+def format_interest_data(df: pd.DataFrame, keywords: list[str]) -> pd.DataFrame:
+    """
+    Format the interest over time data as a DataFrame, for inspecting what
+    interest_to_rows writes to Google Sheets.
+    """
+    rows = interest_to_rows(df, keywords)
+    return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+def format_related_queries(related_queries: dict, keywords: list[str]) -> pd.DataFrame:
+    """
+    Format related queries data as a DataFrame, for inspecting what
+    related_to_rows writes to Google Sheets.
+    """
+    rows = related_to_rows(related_queries, keywords)
+    return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+def plan_worksheet(worksheets: dict, sheet_requests: list, tab_name: str, rows: int) -> dict:
+    """
+    Plan the spreadsheets.batchUpdate requests that make a worksheet ready for
+    `rows` rows, without sending them, and return its properties.
+    
+    New worksheets get WORKSHEET_ROWS rows up front so later runs don't need
+    resizing; an existing worksheet is only grown if `rows` wouldn't fit, or if
+    it has fewer than WORKSHEET_COLS columns (EXTENT_RANGE is in the last one).
+    
+    Args:
+        worksheets: Sheet properties by title, fetched once per run; planned worksheets are added to it
+        sheet_requests: Planned addSheet/updateSheetProperties requests, sent together by the caller
+        rows: Number of rows about to be written
+    """
+    grid = {"rowCount": max(rows, WORKSHEET_ROWS), "columnCount": WORKSHEET_COLS}
+    properties = worksheets.get(tab_name)
+    if properties is None:
+        print(f"  Creating new worksheet: {tab_name}")
+        properties = {"title": tab_name, "gridProperties": grid}
+        sheet_requests.append({"addSheet": {"properties": properties}})
+        worksheets[tab_name] = properties
+        return properties
+    
+    current = properties["gridProperties"]
+    if current["rowCount"] < rows or current["columnCount"] < WORKSHEET_COLS:
+        print(f"  Resizing worksheet: {tab_name}")
+        # Never shrink a worksheet that is already bigger in either direction
+        grid = {
+            "rowCount": max(grid["rowCount"], current["rowCount"]),
+            "columnCount": max(grid["columnCount"], current["columnCount"]),
+        }
+        # A worksheet planned earlier in this run has no sheetId yet; growing its
+        # properties also grows the addSheet request that shares them
+        if "sheetId" in properties:
+            sheet_requests.append({
+                "updateSheetProperties": {
+                    "properties": {"sheetId": properties["sheetId"], "gridProperties": grid},
+                    "fields": "gridProperties(rowCount,columnCount)",
+                },
+            })
+        properties["gridProperties"].update(grid)
+    return properties
+
+
+def read_extents(sheets, tab_names) -> dict[str, tuple[int, int, str | None]]:
+    """
+    Read the (rows, cols, signature) each tab was last written with, from its EXTENT_RANGE cells.
+    Tabs without a readable extent are left out, so write_ranges clears them first.
+    """
+    tab_names = list(tab_names)
+    if not tab_names:
+        return {}
+    
+    response = retry(
+        sheets.values_batch_get,
+        SPREADSHEET_ID,
+        [absolute_range_name(tab, EXTENT_RANGE) for tab in tab_names],
+    )
+    
+    extents = {}
+    for tab, value_range in zip(tab_names, response.get("valueRanges", [])):
+        try:
+            (rows,), (cols,), *rest = value_range["values"]
+            signature = rest[0][0] if rest else None
+            extents[tab] = (int(rows), int(cols), signature)
+        except (KeyError, IndexError, ValueError):
+            continue
+    return extents
+
+
+def post_json(sheets, url: str, body) -> dict:
+    """
+    POST a JSON body through the gspread HTTPClient, serialized with orjson.
+    orjson is much faster than the stdlib encoder requests uses, and writes NaN as null.
+    """
+    response = sheets.request(
+        "post", url, data=orjson.dumps(body), headers={"Content-Type": "application/json"}
+    )
+    return orjson.loads(response.content)
+
+
+def values_signature(values: list[list]) -> str:
+    """
+    Short content hash of a tab's values. Prefixed so USER_ENTERED never parses it as a number.
+    """
+    return "blake2b:" + hashlib.blake2b(orjson.dumps(values), digest_size=16).hexdigest()
+
+
+def write_ranges(sheets, tab_values: dict[str, list[list]], extents: dict[str, tuple[int, int, str | None]]):
+    """
+    Overwrite several tabs with a single values.batchUpdate request.
+    
+    Instead of clearing each tab first, the new values are padded with empty
+    cells out to the area the tab was last written with (from `extents`), so
+    stale rows and columns are blanked in the same request. The new extent is
+    saved alongside the values. Tabs with no known extent are cleared first.
+    Tabs whose values match the signature from their last write are skipped,
+    and no request is made if nothing changed.
+    Each padded grid is rectangular and written to its exact A1 range, with
+    USER_ENTERED so Sheets parses numbers and timestamps as it did before.
+    """
+    signatures = {tab: values_signature(values) for tab, values in tab_values.items()}
+    unchanged = [tab for tab in tab_values if tab in extents and extents[tab][2] == signatures[tab]]
+    for tab in unchanged:
+        print(f"  Unchanged since last write, skipping: {tab}")
+    tab_values = {tab: values for tab, values in tab_values.items() if tab not in unchanged}
+    if not tab_values:
+        return
+    
+    unknown_tabs = [tab for tab in tab_values if tab not in extents]
+    if unknown_tabs:
+        write_request(sheets.values_batch_clear, SPREADSHEET_ID, body={"ranges": [absolute_range_name(tab) for tab in unknown_tabs]})
+    
+    data = []
+    for tab, values in tab_values.items():
+        n_rows = len(values)
+        n_cols = max((len(row) for row in values), default=0)
+        last_rows, last_cols, _ = extents.get(tab, (0, 0, None))
+        
+        # Pad to the larger of the new and previous areas
+        width = max(n_cols, last_cols)
+        padded = [list(row) + [""] * (width - len(row)) for row in values]
+        padded += [[""] * width for _ in range(last_rows - n_rows)]
+        
+        # Exact range for the padded grid, so it is checked against the values sent
+        end = rowcol_to_a1(len(padded), width)
+        data.append({"range": absolute_range_name(tab, f"A1:{end}"), "values": padded})
+        data.append({
+            "range": absolute_range_name(tab, EXTENT_RANGE),
+            "values": [[n_rows], [n_cols], [signatures[tab]]],
+        })
+        extents[tab] = (n_rows, n_cols, signatures[tab])
+    
+    write_request(post_json, sheets, SPREADSHEET_VALUES_BATCH_UPDATE_URL % SPREADSHEET_ID, {
+        "valueInputOption": "USER_ENTERED",
+        "data": data,
+    })
@@ -0,0 +1,206 @@
+"""
+Dashboard update run: fetches every topic in TABS_CONFIG and writes the
+traffic, related queries and log tabs.
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from time import sleep
+from zoneinfo import ZoneInfo
+
+from dashboard.core import (
+    INTEREST_AS_FORMULA,
+    MAX_TOPIC_WORKERS,
+    SPREADSHEET_ID,
+    START_JITTER_SECONDS,
+    TABS_CONFIG,
+    WORKSHEET_COLS,
+    fetch_trends_data,
+    get_google_sheets_client,
+    get_timeframe,
+    interest_to_rows,
+    plan_worksheet,
+    read_extents,
+    related_to_rows,
+    retry,
+    rows_to_split_formula,
+    write_ranges,
+    write_request,
+)
+
+
+def managed_tab_names(topics_config: dict) -> list[str]:
+    """
+    Titles of every tab this script writes: traffic and related tabs per topic, plus the log.
+    """
+    names = []
+    for topic in topics_config:
+        names += [topic, f"{topic} - Related"]
+    return names + ["Update Log"]
+
+
+def update_log_tab(
+    worksheets: dict, sheet_requests: list, pending: dict, topics_config: dict, run_time: str, errors: dict = None
+):
+    """
+    Update the log/metadata tab with update history, configuration, and any errors.
+    The values are added to `pending` and written with the other tabs at the end of the run.
+    """
+    print("Updating log tab...")
+    
+    # Build log data
+    log_data = [
+        ["Last Updated", run_time],
+        ["", ""],
+        ["Topics Tracked", "Keywords", "Status"],
+    ]
+    
+    for topic, config in topics_config.items():
+        if errors and topic in errors:
+            status = f"ERROR: {errors[topic]}"
+        else:
+            status = "OK"
+        log_data.append([topic, ", ".join(config["keywords"]), status])
+    
+    log_data.append(["", ""])
+    log_data.append(["Sheets Structure", ""])
+    log_data.append(["- Traffic sheets", "Interest over time (last 24 hours)"])
+    log_data.append(["- Related sheets", "Top and rising related queries"])
+    
+    if errors:
+        log_data.append(["", ""])
+        log_data.append(["Note", "Failed topics retain previous data until next successful update"])
+    
+    plan_worksheet(worksheets, sheet_requests, "Update Log", rows=len(log_data))
+    pending["Update Log"] = log_data
+
+
+def update_tabs_for_topic(
+    worksheets: dict, sheet_requests: list, pending: dict, base_tab_name: str, keywords: list[str], data: dict
+):
+    """
+    Update both traffic and related tabs for a topic.
+    The values are added to `pending` and written with the other tabs at the end of the run.
+    
+    Args:
+        worksheets: Sheet properties by title, as passed to plan_worksheet
+        sheet_requests: Planned worksheet changes, as passed to plan_worksheet
+        pending: Values by title for the single write_ranges call at the end of the run
+        data: fetch_trends_data() result for the keywords
+    """
+    print(f"Updating tabs for: {base_tab_name}")
+    
+    # Traffic tab uses the main tab name, related queries get a " - Related" suffix
+    related_tab_name = f"{base_tab_name} - Related"
+    tab_values = {
+        base_tab_name: interest_to_rows(data["interest_over_time"], keywords),
+        related_tab_name: related_to_rows(data["related_queries"], keywords),
+    }
+    
+    for tab_name, values in tab_values.items():
+        plan_worksheet(worksheets, sheet_requests, tab_name, rows=len(values))
+    
+    # The formula spills over the same cells, so the worksheet is sized from the rows above
+    if INTEREST_AS_FORMULA:
+        tab_values[base_tab_name] = rows_to_split_formula(tab_values[base_tab_name])
+    
+    pending.update(tab_values)
+    print(f"  Prepared tabs: {base_tab_name}, {related_tab_name}")
+
+
+def main():
+    """
+    Main function to update all tabs in the Google Sheet.
+    """
+    # One timestamp for the whole run, used for the timeframe, cache bucket and log
+    run_ts = datetime.now(ZoneInfo("Australia/Sydney"))
+    run_time = run_ts.strftime("%Y-%m-%d %H:%M:%S")
+    # Same Trends window (incident start to now) for every topic
+    timeframe = get_timeframe(run_ts)
+    
+    print("=" * 50)
+    print("Google Trends Dashboard Update")
+    print(f"Time: {run_time}")
+    print(f"Timeframe: {timeframe}")
+    print("=" * 50)
+    
+    if START_JITTER_SECONDS > 0:
+        delay = random.uniform(0, START_JITTER_SECONDS)
+        print(f"\nWaiting {delay:.0f}s before starting (start jitter)")
+        sleep(delay)
+    
+    # Connect to Google Sheets
+    print("\nConnecting to Google Sheets...")
+    try:
+        sheets = get_google_sheets_client().http_client
+        # One metadata read for the title and every tab, instead of one lookup per tab
+        metadata = retry(sheets.fetch_sheet_metadata, SPREADSHEET_ID)
+        print(f"Connected to: {metadata['properties']['title']}")
+        worksheets = {sheet["properties"]["title"]: sheet["properties"] for sheet in metadata["sheets"]}
+        # Only read tabs this script manages, and only those wide enough to hold
+        # EXTENT_RANGE; narrower ones are grown by plan_worksheet and cleared on write
+        extents = read_extents(sheets, [
+            tab for tab in managed_tab_names(TABS_CONFIG)
+            if worksheets.get(tab, {}).get("gridProperties", {}).get("columnCount", 0) >= WORKSHEET_COLS
+        ])
+    except Exception as e:
+        print(f"Failed to connect to Google Sheets: {e}")
+        raise
+    
+    # Fetch all topics in parallel (paced by TRENDS_BUCKET), and prepare each one from
+    # this thread as soon as its data arrives, so Sheets calls never run concurrently
+    errors = {}
+    sheet_requests = []
+    pending = {}
+    with ThreadPoolExecutor(max_workers=min(len(TABS_CONFIG), MAX_TOPIC_WORKERS)) as executor:
+        fetches = {}
+        for tab_name, config in TABS_CONFIG.items():
+            print(f"Fetching trends for: {config['keywords']}")
+            fetches[executor.submit(fetch_trends_data, config["keywords"], timeframe, run_ts)] = tab_name
+        
+        # Update each topic (creates both traffic and related tabs)
+        for fetch in as_completed(fetches):
+            tab_name = fetches[fetch]
+            print(f"\n{'─' * 40}")
+            try:
+                data = fetch.result()
+            except Exception as e:
+                print(f"Error fetching trends for {tab_name}: {e}")
+                print("  Preserving previous data in sheets")
+                errors[tab_name] = str(e)
+                continue
+            
+            try:
+                update_tabs_for_topic(worksheets, sheet_requests, pending, tab_name, TABS_CONFIG[tab_name]["keywords"], data)
+            except Exception as e:
+                print(f"Error updating {tab_name}: {e}")
+                errors[tab_name] = str(e)
+                # Continue with other topics even if one fails
+                continue
+    
+    # Update the log/metadata tab
+    print(f"\n{'─' * 40}")
+    try:
+        update_log_tab(worksheets, sheet_requests, pending, TABS_CONFIG, run_time, errors)
+    except Exception as e:
+        print(f"Error updating log tab: {e}")
+    
+    # Create and resize worksheets in one spreadsheets.batchUpdate request
+    if sheet_requests:
+        print(f"\nApplying {len(sheet_requests)} worksheet changes...")
+        write_request(sheets.batch_update, SPREADSHEET_ID, {"requests": sheet_requests})
+        # New worksheets start empty, so write_ranges doesn't need to clear them
+        for request in sheet_requests:
+            if "addSheet" in request:
+                extents[request["addSheet"]["properties"]["title"]] = (0, 0, None)
+    
+    # Write every tab in one values.batchUpdate request
+    print(f"\nWriting {len(pending)} tabs...")
+    write_ranges(sheets, pending, extents)
+    print("  Successfully updated all tabs")
+    
+    print(f"\n{'=' * 50}")
+    print("Update complete!")
+    print("=" * 50)
+